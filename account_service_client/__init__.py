@@ -1,5 +1,9 @@
-from .decorator import AccountServiceError, account_rate_limit
-
-__all__ = ["account_rate_limit", "AccountServiceError"]
-
+from .client import aclose_shared_clients
+from .decorator import AccountServiceError, account_rate_limit, reset_reserve_fallback_cache
 
+__all__ = [
+    "account_rate_limit",
+    "AccountServiceError",
+    "aclose_shared_clients",
+    "reset_reserve_fallback_cache",
+]
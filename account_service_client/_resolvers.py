@@ -0,0 +1,158 @@
+"""
+Per-call argument resolution for `account_rate_limit`.
+
+Kept synchronous and free of third-party imports so `setup.py` can compile it with mypyc.
+"""
+
+from __future__ import annotations
+
+import inspect
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+# Argument names checked, in priority order, for the page size and the account override.
+PAGE_KEYS: Tuple[str, ...] = ("records_per_page", "page_size", "per_page")
+OVERRIDE_KEYS: Tuple[str, ...] = ("account_id", "account_override", "user_account_id", "x_user_id")
+
+# Arguments of the wrapped function that the resolvers below read.
+ARGUMENT_KEYS: Tuple[str, ...] = ("num_results", *PAGE_KEYS, *OVERRIDE_KEYS)
+
+# (name, positional index or None, accepted by keyword, default or Parameter.empty)
+ArgumentPlan = Tuple[Tuple[str, Optional[int], bool, Any], ...]
+
+
+def build_argument_plan(
+    signature: inspect.Signature,
+    keys: Tuple[str, ...] = ARGUMENT_KEYS,
+) -> ArgumentPlan:
+    """Record where each of `keys` the resolvers read can be found in a call."""
+    plan: List[Tuple[str, Optional[int], bool, Any]] = []
+    for position, parameter in enumerate(signature.parameters.values()):
+        if parameter.name not in keys:
+            continue
+        if parameter.kind in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD):
+            continue
+        positional: Optional[int] = None
+        if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD):
+            positional = position
+        keyword = parameter.kind is not parameter.POSITIONAL_ONLY
+        plan.append((parameter.name, positional, keyword, parameter.default))
+    return tuple(plan)
+
+
+# (positional capacity or None with *args, name per positional slot or None for
+# positional-only, names accepted by keyword, accepts **kwargs)
+CallShape = Tuple[Optional[int], Tuple[Optional[str], ...], FrozenSet[str], bool]
+
+
+def build_call_shape(signature: inspect.Signature) -> CallShape:
+    """Record which argument shapes a call to `signature` can bind to."""
+    positional_names: List[Optional[str]] = []
+    keyword_names: List[str] = []
+    var_positional = False
+    var_keyword = False
+    for parameter in signature.parameters.values():
+        if parameter.kind is parameter.POSITIONAL_ONLY:
+            positional_names.append(None)
+        elif parameter.kind is parameter.POSITIONAL_OR_KEYWORD:
+            positional_names.append(parameter.name)
+            keyword_names.append(parameter.name)
+        elif parameter.kind is parameter.KEYWORD_ONLY:
+            keyword_names.append(parameter.name)
+        elif parameter.kind is parameter.VAR_POSITIONAL:
+            var_positional = True
+        else:
+            var_keyword = True
+    capacity = None if var_positional else len(positional_names)
+    return capacity, tuple(positional_names), frozenset(keyword_names), var_keyword
+
+
+def call_fits(shape: CallShape, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> bool:
+    """Return False for calls `bind_partial` would reject, without building a BoundArguments."""
+    capacity, positional_names, keyword_names, var_keyword = shape
+    if capacity is not None and len(args) > capacity:
+        return False
+    if kwargs:
+        bound_positionally = positional_names[: len(args)]
+        for name in kwargs:
+            if name in bound_positionally:
+                return False
+            if not var_keyword and name not in keyword_names:
+                return False
+    return True
+
+
+def page_keys_for(signature: inspect.Signature) -> Tuple[str, ...]:
+    """Return the page-size keys the signature declares, in priority order."""
+    return tuple(key for key in PAGE_KEYS if key in signature.parameters)
+
+
+def collect_arguments(
+    plan: ArgumentPlan,
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Equivalent of `bind_partial` + `apply_defaults`, limited to the planned arguments."""
+    arguments: Dict[str, Any] = {}
+    for name, positional, keyword, default in plan:
+        if keyword and name in kwargs:
+            arguments[name] = kwargs[name]
+        elif positional is not None and positional < len(args):
+            arguments[name] = args[positional]
+        elif default is not inspect.Parameter.empty:
+            arguments[name] = default
+    return arguments
+
+
+def resolve_fixed_request_count(
+    request_count: Optional[int],
+    calculate_request_count: bool,
+) -> Optional[int]:
+    """Return the request count when it does not depend on call arguments, else None."""
+    if request_count is not None:
+        return max(int(request_count), 1)
+
+    if not calculate_request_count:
+        return 1
+
+    return None
+
+
+def resolve_request_count(arguments: Dict[str, Any], page_keys: Tuple[str, ...]) -> int:
+    num_results = arguments.get("num_results")
+    if num_results is None:
+        return 1
+
+    try:
+        num_results_int = int(num_results)
+    except (TypeError, ValueError):
+        return 1
+
+    records_per_page = resolve_records_per_page(arguments, page_keys)
+    if records_per_page <= 0:
+        records_per_page = 1
+
+    return max(-(-num_results_int // records_per_page), 1)
+
+
+def resolve_records_per_page(arguments: Dict[str, Any], page_keys: Tuple[str, ...]) -> int:
+    for key in page_keys:
+        value = arguments.get(key)
+        if value is None:
+            continue
+        try:
+            parsed = int(value)
+            if parsed > 0:
+                return parsed
+        except (TypeError, ValueError):
+            continue
+    return 1
+
+
+def resolve_account_override(arguments: Dict[str, Any]) -> Optional[str]:
+    for key in OVERRIDE_KEYS:
+        value = arguments.get(key)
+        if value:
+            return str(value)
+    return None
+
+
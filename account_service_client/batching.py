@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+BATCH_WINDOW = 0.0005
+MAX_BATCH_SIZE = 1000
+
+# send(total_request_count, per_call_counts or None) -> reserve response
+SendReserve = Callable[[int, Optional[List[int]]], Awaitable[Dict[str, Any]]]
+
+
+class _Batch:
+    __slots__ = ("send", "entries", "timer")
+
+    def __init__(self, send: SendReserve) -> None:
+        self.send = send
+        self.entries: List[Tuple[int, asyncio.Future]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class BatchReserver:
+    """
+    Coalesce concurrent reservations that share a key into a single upstream reserve call.
+
+    Calls arriving within `window` seconds of the first pending call for a key, or until
+    `max_size` calls are queued, are sent together as one reserve for the summed request
+    count. Each waiter receives the upstream response with its own `request_count` and its
+    own copy of `account`; a batch of one is sent and returned exactly as an unbatched call
+    would be.
+    """
+
+    def __init__(self, window: float = BATCH_WINDOW, max_size: int = MAX_BATCH_SIZE) -> None:
+        self._window = window
+        self._max_size = max_size
+        self._batches: Dict[Hashable, _Batch] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def reserve(self, key: Hashable, request_count: int, send: SendReserve) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = _Batch(send)
+            batch.timer = loop.call_later(self._window, self._flush, key)
+
+        future: asyncio.Future = loop.create_future()
+        batch.entries.append((request_count, future))
+        if len(batch.entries) >= self._max_size:
+            self._flush(key)
+        return await future
+
+    def _flush(self, key: Hashable) -> None:
+        batch = self._batches.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.ensure_future(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: _Batch) -> None:
+        counts = [count for count, _ in batch.entries]
+        try:
+            if len(counts) == 1:
+                response = await batch.send(counts[0], None)
+            else:
+                response = await batch.send(sum(counts), counts)
+        except asyncio.CancelledError:
+            for _, future in batch.entries:
+                future.cancel()
+            raise
+        except Exception as exc:
+            for _, future in batch.entries:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        if len(counts) == 1:
+            _, future = batch.entries[0]
+            if not future.done():
+                future.set_result(response)
+            return
+
+        # Each waiter gets its own copy of the account so callers can mutate it freely.
+        for count, future in batch.entries:
+            if not future.done():
+                result = {**response, "request_count": count}
+                if "account" in response:
+                    result["account"] = copy.deepcopy(response["account"])
+                future.set_result(result)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, List, Optional
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker over a rolling time window.
+
+    Outcomes are counted in `buckets` equal slices of `window` seconds. Once the window holds
+    at least `min_requests` outcomes and the failure ratio reaches `failure_threshold`, the
+    breaker opens for `cooldown` seconds. After that a single probe call is let through: a
+    success closes the breaker, a failure opens it again. Callers pass `probe=True` when
+    recording the probe's outcome; other outcomes reported while open are ignored.
+    """
+
+    def __init__(
+        self,
+        *,
+        window: float = 10.0,
+        buckets: int = 10,
+        failure_threshold: float = 0.5,
+        min_requests: int = 20,
+        cooldown: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._bucket_width = window / buckets
+        self._failure_threshold = failure_threshold
+        self._min_requests = min_requests
+        self._cooldown = cooldown
+        self._clock = clock
+        self._epochs: List[int] = [-1] * buckets
+        self._totals: List[int] = [0] * buckets
+        self._failures: List[int] = [0] * buckets
+        self._opened_at: Optional[float] = None
+        self._probe_started: Optional[float] = None
+
+    def is_open(self) -> bool:
+        """Return True when calls should be short-circuited; may admit a half-open probe."""
+        if self._opened_at is None:
+            return False
+        now = self._clock()
+        if now - self._opened_at < self._cooldown:
+            return True
+        # Half-open: admit one probe, and another if the previous one never reported back.
+        if self._probe_started is not None and now - self._probe_started < self._cooldown:
+            return True
+        self._probe_started = now
+        return False
+
+    @property
+    def half_open(self) -> bool:
+        """True while tripped; a call that `is_open()` lets through in this state is the probe."""
+        return self._opened_at is not None
+
+    def record_success(self, *, probe: bool = False) -> None:
+        if self._opened_at is not None:
+            # Only the probe decides; calls that were in flight when the breaker tripped
+            # finish late and must not close it.
+            if probe:
+                self._reset()
+            return
+        self._record(failed=False)
+
+    def record_failure(self, *, probe: bool = False) -> None:
+        if self._opened_at is not None:
+            if probe:
+                self._opened_at = self._clock()
+                self._probe_started = None
+            return
+
+        now = self._record(failed=True)
+        total = sum(self._totals)
+        if total >= self._min_requests and sum(self._failures) >= total * self._failure_threshold:
+            self._opened_at = now
+
+    def _record(self, *, failed: bool) -> float:
+        now = self._clock()
+        epoch = int(now / self._bucket_width)
+        # Drop buckets that have rotated out of the window before counting into one.
+        for index, bucket_epoch in enumerate(self._epochs):
+            if epoch - bucket_epoch >= len(self._epochs):
+                self._epochs[index] = -1
+                self._totals[index] = 0
+                self._failures[index] = 0
+        index = epoch % len(self._epochs)
+        if self._epochs[index] != epoch:
+            self._epochs[index] = epoch
+            self._totals[index] = 0
+            self._failures[index] = 0
+        self._totals[index] += 1
+        if failed:
+            self._failures[index] += 1
+        return now
+
+    def _reset(self) -> None:
+        self._opened_at = None
+        self._probe_started = None
+        for index in range(len(self._epochs)):
+            self._epochs[index] = -1
+            self._totals[index] = 0
+            self._failures[index] = 0
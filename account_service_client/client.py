@@ -1,45 +1,159 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import asyncio
+import atexit
+import contextlib
+import importlib.util
+import json
+import weakref
+from functools import lru_cache
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Dict, NamedTuple, Optional, Tuple
 
 import httpx
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
-class AccountServiceClient:
-    def __init__(self, base_url: str, timeout: float = 10.0) -> None:
+_loads: Callable[[bytes], Any]
+_dumps: Callable[[Any], bytes]
+if orjson is not None:
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+else:
+    _loads = json.loads
+
+    def _dumps(payload: Any) -> bytes:
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class _AccountPaths(NamedTuple):
+    get: str
+    reserve: str
+
+
+@lru_cache(maxsize=128)
+def _account_paths(account_type: str) -> _AccountPaths:
+    return _AccountPaths(
+        get=f"/api/v1/accounts/{account_type}/get",
+        reserve=f"/api/v1/accounts/{account_type}/reserve",
+    )
+
+
+# HTTP/2 lets concurrent calls multiplex over one connection; httpx needs the optional
+# `h2` package for it and negotiates it via TLS ALPN, falling back to HTTP/1.1.
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Shared clients are scoped to the event loop they were created on; an httpx
+# connection pool cannot be reused across loops. Open connections reference their loop,
+# so entries are evicted explicitly when the loop shuts down rather than by the weakref.
+_SharedKey = Tuple[str, float, int, float]
+_shared_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, Dict[_SharedKey, AccountServiceClient]
+] = weakref.WeakKeyDictionary()
+# Async generators that close a loop's shared clients when the loop shuts down; the loop
+# itself only holds them weakly.
+_loop_closers: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, AsyncGenerator[None, None]
+] = weakref.WeakKeyDictionary()
+
+
+class AccountServiceClient(contextlib.AbstractAsyncContextManager):
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 10.0,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        """
+        Args:
+            base_url: Account Service root URL.
+            timeout: Request timeout in seconds.
+            client: Existing `httpx.AsyncClient` to send requests with. An injected client
+                is used as-is and is not closed on context exit; its caller owns it. When
+                omitted, a client is created here and closed on context exit, after which
+                the instance cannot be reused.
+        """
         self._base_url = base_url.rstrip("/")
         self._timeout = timeout
-        self._client: Optional[httpx.AsyncClient] = None
-
-    async def __aenter__(self) -> "AccountServiceClient":
-        if not self._client:
-            self._client = httpx.AsyncClient(base_url=self._base_url, timeout=self._timeout)
-        return self
+        self._owns_httpx = client is None
+        if client is None:
+            client = httpx.AsyncClient(base_url=self._base_url, timeout=self._timeout)
+        self._httpx = client
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        if self._owns_httpx:
+            await self.aclose()
+
+    @classmethod
+    def get_shared(
+        cls,
+        base_url: str,
+        timeout: float = 10.0,
+        *,
+        max_keepalive: int = 50,
+        keepalive_expiry: float = 30.0,
+    ) -> "AccountServiceClient":
+        """
+        Return a long-lived client bound to the running event loop.
+
+        The underlying connection pool is kept open so that repeated calls reuse
+        keep-alive connections instead of paying a new TCP/TLS handshake each time.
+
+        Args:
+            max_keepalive: Idle connections kept open; the pool allows twice as many in
+                total so bursts above the keep-alive size queue less. 0 disables
+                keep-alive and leaves the total number of connections unlimited.
+            keepalive_expiry: Seconds an idle connection is kept before being closed.
+        """
+        clients = _loop_clients(asyncio.get_running_loop())
+        key = (base_url.rstrip("/"), timeout, max_keepalive, keepalive_expiry)
+        shared = clients.get(key)
+        if shared is None or shared._httpx.is_closed:
+            shared = cls(
+                base_url,
+                timeout,
+                client=httpx.AsyncClient(
+                    base_url=key[0],
+                    timeout=timeout,
+                    limits=httpx.Limits(
+                        max_keepalive_connections=max_keepalive,
+                        max_connections=max_keepalive * 2 if max_keepalive else None,
+                        keepalive_expiry=keepalive_expiry,
+                    ),
+                    http2=_HTTP2_AVAILABLE,
+                ),
+            )
+            clients[key] = shared
+        return shared
+
+    async def aclose(self) -> None:
+        await self._httpx.aclose()
+
+    @property
+    def base_url(self) -> str:
+        return self._base_url
 
     @property
     def client(self) -> httpx.AsyncClient:
-        if not self._client:
-            raise RuntimeError("AccountServiceClient must be used within an async context manager")
-        return self._client
+        return self._httpx
 
     async def get_account(
         self,
         type: str,
         account_id: Optional[str] = None,
     ) -> Dict[str, Any]:
-        account_type = type
         headers: Dict[str, str] = {}
         if account_id:
             headers["x-user-id"] = account_id
 
-        response = await self.client.get(f"/api/v1/accounts/{account_type}/get", headers=headers)
+        response = await self._httpx.get(_account_paths(type).get, headers=headers)
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
 
     async def reserve_account(
         self,
@@ -47,17 +161,16 @@ class AccountServiceClient:
         payload: Dict[str, Any],
         account_id: Optional[str] = None,
     ) -> Dict[str, Any]:
-        account_type = type
-        headers: Dict[str, str] = {}
+        headers: Dict[str, str] = dict(_JSON_HEADERS)
         if account_id:
             headers["x-user-id"] = account_id
-        response = await self.client.post(
-            f"/api/v1/accounts/{account_type}/reserve",
-            json=payload,
+        response = await self._httpx.post(
+            _account_paths(type).reserve,
+            content=_dumps(payload),
             headers=headers,
         )
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
 
     async def update_rate_limit(
         self,
@@ -69,11 +182,87 @@ class AccountServiceClient:
             "type": type,
             "increment": increment,
         }
-        response = await self.client.post(
+        response = await self._httpx.post(
             f"/api/v1/accounts/{account_id}/rate-limit/update",
-            json=payload,
+            content=_dumps(payload),
+            headers=_JSON_HEADERS,
         )
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
+
+
+async def aclose_shared_clients() -> None:
+    """
+    Close the shared clients created on the running event loop.
+
+    Await this before closing a loop you manage yourself. Under `asyncio.run` (or any loop
+    whose `shutdown_asyncgens` runs before it closes) the clients are also closed for you.
+    """
+    loop = asyncio.get_running_loop()
+    _discard_closer(loop)
+    await _aclose_loop_clients(loop)
+
+
+async def _aclose_loop_clients(loop: asyncio.AbstractEventLoop) -> None:
+    clients = _shared_clients.pop(loop, {})
+    for shared in clients.values():
+        await shared.aclose()
+
+
+def _loop_clients(loop: asyncio.AbstractEventLoop) -> Dict[_SharedKey, AccountServiceClient]:
+    clients = _shared_clients.get(loop)
+    if clients is None:
+        # Loops closed without `aclose_shared_clients()` or `shutdown_asyncgens` (e.g. a
+        # bare `loop.close()`) are dropped here so they do not accumulate. Their clients
+        # can no longer be closed on their own loop; the sockets are released when
+        # collected.
+        for closed in [other for other in _shared_clients if other.is_closed()]:
+            del _shared_clients[closed]
+            _discard_closer(closed)
+        clients = _shared_clients[loop] = {}
+        _close_clients_on_shutdown(loop)
+    return clients
+
+
+async def _shutdown_closer(loop: asyncio.AbstractEventLoop) -> AsyncIterator[None]:
+    try:
+        yield
+    finally:
+        # Closers finished by `_discard_closer` have already been unregistered.
+        if _loop_closers.pop(loop, None) is not None:
+            await _aclose_loop_clients(loop)
+
+
+def _close_clients_on_shutdown(loop: asyncio.AbstractEventLoop) -> None:
+    """
+    Close the loop's shared clients when its `shutdown_asyncgens` runs.
+
+    Starting an async generator registers it through the running loop's asyncgen hooks,
+    which asyncio and uvloop both use to close pending generators at shutdown; closing
+    this one closes the clients. Loops that install no hooks rely on the sweep above.
+    """
+    closer = _shutdown_closer(loop)
+    # Step the generator to its `yield` so closing it runs the `finally` block.
+    with contextlib.suppress(StopIteration):
+        closer.__anext__().send(None)
+    _loop_closers[loop] = closer
+
+
+def _discard_closer(loop: asyncio.AbstractEventLoop) -> None:
+    closer = _loop_closers.pop(loop, None)
+    if closer is not None:
+        # Finish it now; left suspended, the loop would finalize it later and close
+        # whatever shared clients exist by then.
+        with contextlib.suppress(StopIteration):
+            closer.aclose().send(None)
 
 
+@atexit.register
+def _close_shared_clients_at_exit() -> None:
+    for loop, clients in list(_shared_clients.items()):
+        _discard_closer(loop)
+        if loop.is_closed() or loop.is_running():
+            continue
+        for shared in clients.values():
+            loop.run_until_complete(shared.aclose())
+    _shared_clients.clear()
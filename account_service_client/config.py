@@ -1,18 +1,42 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+from typing import NamedTuple, Optional
 
+_cached_config: Optional["ClientConfig"] = None
 
-@dataclass(frozen=True)
-class ClientConfig:
+
+class ClientConfig(NamedTuple):
     base_url: str
     timeout: float
+    max_keepalive: int = 50
+    keepalive_expiry: float = 30.0
 
     @classmethod
     def from_env(cls) -> "ClientConfig":
         base_url = os.getenv("ACCOUNT_SERVICE_BASE_URL", "http://localhost:8000")
         timeout = float(os.getenv("ACCOUNT_SERVICE_TIMEOUT", "10"))
-        return cls(base_url=base_url.rstrip("/"), timeout=timeout)
+        max_keepalive = int(os.getenv("ACCOUNT_SERVICE_MAX_KEEPALIVE", "50"))
+        if max_keepalive < 0:
+            raise ValueError(f"ACCOUNT_SERVICE_MAX_KEEPALIVE must be >= 0, got {max_keepalive}")
+        keepalive_expiry = float(os.getenv("ACCOUNT_SERVICE_KEEPALIVE_EXPIRY", "30"))
+        return cls(
+            base_url=base_url.rstrip("/"),
+            timeout=timeout,
+            max_keepalive=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
 
+    @classmethod
+    def cached(cls) -> "ClientConfig":
+        """Return the environment configuration, reading it only on first use."""
+        global _cached_config
+        if _cached_config is None:
+            _cached_config = cls.from_env()
+        return _cached_config
 
+    @classmethod
+    def reset_cache(cls) -> None:
+        """Forget the cached configuration so the next `cached()` re-reads the environment."""
+        global _cached_config
+        _cached_config = None
@@ -1,27 +1,66 @@
 from __future__ import annotations
 
+import asyncio
 import inspect
-import math
-from functools import wraps
-from typing import Any, Awaitable, Callable, Optional, TypeVar
+import random
+import time
+from functools import partial, wraps
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
 
 import httpx
 
+from ._resolvers import (
+    ARGUMENT_KEYS,
+    OVERRIDE_KEYS,
+    build_argument_plan,
+    build_call_shape,
+    call_fits,
+    collect_arguments,
+    page_keys_for,
+    resolve_account_override,
+    resolve_fixed_request_count,
+    resolve_request_count,
+)
+from .batching import BatchReserver
+from .breaker import CircuitBreaker
 from .client import AccountServiceClient
 from .config import ClientConfig
 
 F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
 
+_batch_reserver = BatchReserver()
+
+# One breaker per Account Service base URL.
+_breakers: Dict[str, CircuitBreaker] = {}
+
+# Retries for 429 responses, with full-jitter exponential backoff. A Retry-After longer
+# than the cap is treated as a failure instead of stalling the caller.
+_RATE_LIMIT_RETRIES = 2
+_RATE_LIMIT_BACKOFF = 0.1
+_RATE_LIMIT_MAX_DELAY = 2.0
+
+# (base_url, account type) pairs whose server answered an un-overridden reserve with 404,
+# mapped to the monotonic time until which reserve is skipped. The TTL lets a server that
+# is upgraded mid-process be picked up again.
+_legacy_reserve_types: Dict[Tuple[str, str], float] = {}
+_LEGACY_RESERVE_TTL = 300.0
+
 
 class AccountServiceError(RuntimeError):
     pass
 
 
+def reset_reserve_fallback_cache() -> None:
+    """Forget which Account Service deployments were found to lack the reserve endpoint."""
+    _legacy_reserve_types.clear()
+
+
 def account_rate_limit(
     *,
     type: str,
     request_count: Optional[int] = None,
     calculate_request_count: bool = False,
+    batch: bool = False,
 ) -> Callable[[F], F]:
     """
     Decorator that reserves quota with Account Service before executing the wrapped crawler function.
@@ -31,6 +70,9 @@ def account_rate_limit(
         request_count: Fixed request count to reserve. Defaults to 1 if not provided.
         calculate_request_count: When True, derives request count from `num_results` and
             the function arguments (`records_per_page` / `page_size`).
+        batch: When True, concurrent calls with the same account type and override that
+            arrive within a short window share one reserve request for their combined
+            count. Every call in the batch is handed the same account.
     """
 
     def decorator(func: F) -> F:
@@ -39,130 +81,209 @@ def account_rate_limit(
 
         signature = inspect.signature(func)
         account_type = type
-
-        @wraps(func)
-        async def wrapper(*args: Any, **kwargs: Any) -> Any:
-            bound = signature.bind_partial(*args, **kwargs)
-            bound.apply_defaults()
-
-            account_override = _resolve_account_override(bound.arguments)
-            resolved_request_count = _resolve_request_count(
-                bound.arguments,
-                request_count=request_count,
-                calculate_request_count=calculate_request_count,
+        # Without a `num_results` parameter a calculated count always comes out as 1.
+        fixed_request_count = resolve_fixed_request_count(
+            request_count,
+            calculate_request_count and "num_results" in signature.parameters,
+        )
+        # With a fixed count only the account override is read from the call.
+        argument_plan = build_argument_plan(
+            signature,
+            ARGUMENT_KEYS if fixed_request_count is None else OVERRIDE_KEYS,
+        )
+        call_shape = build_call_shape(signature)
+        page_keys = page_keys_for(signature)
+        # Bound once here so each call reads closure cells instead of module attributes.
+        load_config = ClientConfig.cached
+        get_client = AccountServiceClient.get_shared
+
+        async def reserve(account_override: Optional[str], resolved_request_count: int) -> Dict[str, Any]:
+            """Reserve quota and return the keyword arguments to inject into `func`."""
+            config = load_config()
+            client = get_client(
+                config.base_url,
+                config.timeout,
+                max_keepalive=config.max_keepalive,
+                keepalive_expiry=config.keepalive_expiry,
             )
 
-            config = ClientConfig.from_env()
-
-            try:
-                async with AccountServiceClient(config.base_url, config.timeout) as client:
-                    reserve_payload: dict[str, Any] = {"request_count": resolved_request_count}
-                    try:
-                        reserve_response = await client.reserve_account(
-                            type=account_type,
-                            payload=reserve_payload,
-                            account_id=account_override,
-                        )
-                        account_payload = reserve_response.get("account") or {}
-                    except httpx.HTTPStatusError as exc:
-                        if exc.response.status_code == 404:
-                            # Fallback: use get_account + update_rate_limit for older API versions
-                            get_response = await client.get_account(
-                                type=account_type,
-                                account_id=account_override,
-                            )
-                            account_id = get_response.get("account_id")
-                            if not account_id:
-                                raise AccountServiceError("Account Service response missing account_id")
-                            await client.update_rate_limit(
-                                account_id=account_id,
-                                type=account_type,
-                                increment=resolved_request_count,
-                            )
-                            # Extract the nested account document from the response
-                            account_payload = get_response.get("account") or {}
-                            reserve_response = {
-                                "account": account_payload,
-                                "account_id": account_id,
-                                "request_count": resolved_request_count,
-                            }
-                        else:
-                            raise
-            except httpx.HTTPStatusError as exc:
-                raise AccountServiceError(
-                    f"Account Service request failed ({exc.response.status_code}): {exc.response.text}"
-                ) from exc
-            except httpx.HTTPError as exc:
-                raise AccountServiceError(f"Account Service request error: {exc}") from exc
-
-            account_payload = reserve_response.get("account") or account_payload or {}
+            if batch:
+                reserve_response = await _batch_reserver.reserve(
+                    (client, account_type, account_override),
+                    resolved_request_count,
+                    partial(_reserve, client, account_type, account_override),
+                )
+            else:
+                reserve_response = await _reserve(
+                    client,
+                    account_type,
+                    account_override,
+                    resolved_request_count,
+                )
+
             account_id = reserve_response.get("account_id")
             if not account_id:
                 raise AccountServiceError("Account Service response missing account_id")
-            resolved_request_count = reserve_response.get("request_count", resolved_request_count)
 
-            injected = {
-                "account": account_payload,
+            return {
+                "account": reserve_response.get("account") or {},
                 "account_id": account_id,
-                "request_count": resolved_request_count,
+                "request_count": reserve_response.get("request_count", resolved_request_count),
             }
 
-            call_kwargs = dict(bound.kwargs)
-            call_kwargs.update(injected)
-            return await func(*bound.args, **call_kwargs)
+        if not argument_plan and fixed_request_count is not None:
+            # The signature declares none of the arguments the resolvers read, so there is
+            # nothing to look up per call.
+            lean_request_count = fixed_request_count
 
-        return wrapper  # type: ignore[return-value]
-
-    return decorator
+            @wraps(func)
+            async def lean_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not call_fits(call_shape, args, kwargs):
+                    signature.bind_partial(*args, **kwargs)
+                injected = await reserve(None, lean_request_count)
+                return await func(*args, **{**kwargs, **injected})
 
+            return lean_wrapper  # type: ignore[return-value]
 
-def _resolve_request_count(
-    arguments: dict[str, Any],
-    *,
-    request_count: Optional[int],
-    calculate_request_count: bool,
-) -> int:
-    if request_count is not None:
-        return max(int(request_count), 1)
-
-    if not calculate_request_count:
-        return 1
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            # Reject calls `func` cannot accept before reserving quota for them; only a
+            # mismatch pays for `bind_partial`, which raises the usual TypeError.
+            if not call_fits(call_shape, args, kwargs):
+                signature.bind_partial(*args, **kwargs)
+            arguments = collect_arguments(argument_plan, args, kwargs)
 
-    num_results = arguments.get("num_results")
-    if num_results is None:
-        return 1
+            account_override = resolve_account_override(arguments)
+            if fixed_request_count is not None:
+                resolved_request_count = fixed_request_count
+            else:
+                resolved_request_count = resolve_request_count(arguments, page_keys)
 
-    try:
-        num_results_int = int(num_results)
-    except (TypeError, ValueError):
-        return 1
+            injected = await reserve(account_override, resolved_request_count)
+            return await func(*args, **{**kwargs, **injected})
 
-    records_per_page = _resolve_records_per_page_from_args(arguments)
-    if records_per_page <= 0:
-        records_per_page = 1
+        return wrapper  # type: ignore[return-value]
 
-    return max(math.ceil(num_results_int / records_per_page), 1)
+    return decorator
 
 
-def _resolve_records_per_page_from_args(arguments: dict[str, Any]) -> int:
-    for key in ("records_per_page", "page_size", "per_page"):
-        value = arguments.get(key)
-        if value is None:
-            continue
+async def _reserve(
+    client: AccountServiceClient,
+    account_type: str,
+    account_override: Optional[str],
+    request_count: int,
+    batch_counts: Optional[List[int]] = None,
+) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {"request_count": request_count}
+    if batch_counts is not None:
+        payload["batch"] = batch_counts
+
+    breaker = _breakers.get(client.base_url)
+    if breaker is None:
+        breaker = _breakers[client.base_url] = CircuitBreaker()
+    if breaker.is_open():
+        raise AccountServiceError("Account Service circuit is open; skipping request")
+    probe = breaker.half_open
+
+    attempt = 0
+    while True:
         try:
-            parsed = int(value)
-            if parsed > 0:
-                return parsed
-        except (TypeError, ValueError):
-            continue
-    return 1
-
-
-def _resolve_account_override(arguments: dict[str, Any]) -> Optional[str]:
-    for key in ("account_id", "account_override", "user_account_id", "x_user_id"):
-        value = arguments.get(key)
-        if value:
-            return str(value)
-    return None
-
-
+            response = await _request_reservation(
+                client,
+                account_type,
+                account_override,
+                request_count,
+                payload,
+            )
+        except httpx.HTTPStatusError as exc:
+            status_code = exc.response.status_code
+            if status_code == 429 and attempt < _RATE_LIMIT_RETRIES:
+                delay = _rate_limit_delay(exc.response, attempt)
+                if delay is not None:
+                    attempt += 1
+                    await asyncio.sleep(delay)
+                    continue
+            if status_code >= 500:
+                breaker.record_failure(probe=probe)
+            else:
+                breaker.record_success(probe=probe)
+            raise AccountServiceError(
+                f"Account Service request failed ({status_code}): {exc.response.text}"
+            ) from exc
+        except httpx.HTTPError as exc:
+            # Waiting too long for a free pooled connection is local saturation, not an
+            # upstream failure.
+            if not isinstance(exc, httpx.PoolTimeout):
+                breaker.record_failure(probe=probe)
+            raise AccountServiceError(f"Account Service request error: {exc}") from exc
+        except AccountServiceError:
+            breaker.record_success(probe=probe)
+            raise
+        breaker.record_success(probe=probe)
+        return response
+
+
+async def _request_reservation(
+    client: AccountServiceClient,
+    account_type: str,
+    account_override: Optional[str],
+    request_count: int,
+    payload: Dict[str, Any],
+) -> Dict[str, Any]:
+    legacy_key = (client.base_url, account_type)
+    legacy_until = _legacy_reserve_types.get(legacy_key)
+    remember_legacy = False
+    if legacy_until is None or legacy_until <= time.monotonic():
+        try:
+            return await client.reserve_account(
+                type=account_type,
+                payload=payload,
+                account_id=account_override,
+            )
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code != 404:
+                raise
+            # Remember the missing endpoint so later calls go straight to the fallback
+            # instead of paying for a 404 round-trip every time. With an account override
+            # a 404 may just mean that account does not exist, so it is not remembered.
+            remember_legacy = account_override is None
+
+    # Fallback: use get_account + update_rate_limit for older API versions. The two calls
+    # stay sequential: the rate-limit update is addressed by the account_id that
+    # get_account returns, and an increment sent speculatively cannot be undone.
+    get_response = await client.get_account(
+        type=account_type,
+        account_id=account_override,
+    )
+    # Only a working fallback confirms an older API; a 404 from both endpoints is not
+    # remembered.
+    if remember_legacy:
+        _legacy_reserve_types[legacy_key] = time.monotonic() + _LEGACY_RESERVE_TTL
+    account_id = get_response.get("account_id")
+    if not account_id:
+        raise AccountServiceError("Account Service response missing account_id")
+    await client.update_rate_limit(
+        account_id=account_id,
+        type=account_type,
+        increment=request_count,
+    )
+    # Extract the nested account document from the response
+    return {
+        "account": get_response.get("account"),
+        "account_id": account_id,
+        "request_count": request_count,
+    }
+
+
+def _rate_limit_delay(response: httpx.Response, attempt: int) -> Optional[float]:
+    """Return how long to wait before retrying a 429, or None to give up."""
+    delay = random.uniform(0, _RATE_LIMIT_BACKOFF * 2**attempt)
+    retry_after = response.headers.get("retry-after")
+    if retry_after is not None:
+        try:
+            delay = max(delay, float(retry_after))
+        except ValueError:
+            pass
+    if delay > _RATE_LIMIT_MAX_DELAY:
+        return None
+    return delay
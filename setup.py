@@ -0,0 +1,13 @@
+import os
+
+from setuptools import setup
+
+ext_modules = []
+if os.getenv("ACCOUNT_SERVICE_MYPYC") == "1":
+    # Compile the per-call argument resolvers to a C extension; everything else stays
+    # pure Python since its cost is dominated by awaiting httpx.
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify(["--ignore-missing-imports", "account_service_client/_resolvers.py"])
+
+setup(ext_modules=ext_modules)
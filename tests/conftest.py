@@ -0,0 +1,60 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from account_service_client import decorator as decorator_module
+from account_service_client import reset_reserve_fallback_cache
+from account_service_client.config import ClientConfig
+
+BASE_URL = "http://account-service.test"
+
+
+@pytest.fixture(autouse=True)
+def account_service_env(monkeypatch):
+    monkeypatch.setenv("ACCOUNT_SERVICE_BASE_URL", BASE_URL)
+    ClientConfig.reset_cache()
+    reset_reserve_fallback_cache()
+    decorator_module._breakers.clear()
+    yield
+    ClientConfig.reset_cache()
+    reset_reserve_fallback_cache()
+    decorator_module._breakers.clear()
+
+
+class _ReserveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("content-length", 0)))
+        time.sleep(self.server.response_delay)
+        body = json.dumps({"account": {}, "account_id": "acc-1"}).encode()
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def live_server(monkeypatch):
+    """
+    A real HTTP server answering every POST with a reserved account.
+
+    Set `response_delay` on the yielded server to slow each response down.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ReserveHandler)
+    server.response_delay = 0.0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setenv("ACCOUNT_SERVICE_BASE_URL", base_url)
+    ClientConfig.reset_cache()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,141 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+import respx
+
+from account_service_client import account_rate_limit
+from account_service_client.batching import BatchReserver
+
+from .conftest import BASE_URL
+
+
+class FakeSend:
+    def __init__(self, response=None, error=None):
+        self.calls = []
+        self._response = response if response is not None else {"account_id": "acc-1"}
+        self._error = error
+
+    async def __call__(self, request_count, batch_counts):
+        self.calls.append((request_count, batch_counts))
+        if self._error is not None:
+            raise self._error
+        return dict(self._response, request_count=request_count)
+
+
+def _gather(reserver, send, counts, key="key"):
+    async def run():
+        return await asyncio.gather(
+            *(reserver.reserve(key, count, send) for count in counts),
+            return_exceptions=True,
+        )
+
+    return asyncio.run(run())
+
+
+def test_concurrent_reservations_are_summed_into_one_call():
+    send = FakeSend()
+
+    results = _gather(BatchReserver(), send, [1, 2, 3])
+
+    assert send.calls == [(6, [1, 2, 3])]
+    assert [result["request_count"] for result in results] == [1, 2, 3]
+    assert all(result["account_id"] == "acc-1" for result in results)
+
+
+def test_single_reservation_is_sent_unbatched():
+    send = FakeSend(response={"account_id": "acc-1", "extra": True})
+
+    (result,) = _gather(BatchReserver(), send, [4])
+
+    assert send.calls == [(4, None)]
+    assert result == {"account_id": "acc-1", "extra": True, "request_count": 4}
+
+
+def test_each_waiter_gets_its_own_account():
+    send = FakeSend(response={"account_id": "acc-1", "account": {"cookies": {"sid": "x"}}})
+
+    first, second = _gather(BatchReserver(), send, [1, 2])
+
+    assert first["account"] == second["account"] == {"cookies": {"sid": "x"}}
+    assert first["account"] is not second["account"]
+    assert first["account"]["cookies"] is not second["account"]["cookies"]
+
+
+def test_errors_are_raised_in_every_waiter():
+    error = RuntimeError("upstream down")
+    send = FakeSend(error=error)
+
+    results = _gather(BatchReserver(), send, [1, 1, 1])
+
+    assert len(send.calls) == 1
+    assert results == [error, error, error]
+
+
+def test_keys_are_batched_separately():
+    send = FakeSend()
+    reserver = BatchReserver()
+
+    async def run():
+        return await asyncio.gather(
+            reserver.reserve("a", 1, send),
+            reserver.reserve("b", 2, send),
+            reserver.reserve("a", 3, send),
+        )
+
+    asyncio.run(run())
+
+    assert sorted(send.calls, key=lambda call: call[0]) == [(2, None), (4, [1, 3])]
+
+
+def test_full_batch_is_flushed_without_waiting_for_the_window():
+    send = FakeSend()
+    reserver = BatchReserver(window=60.0, max_size=2)
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(reserver.reserve("key", 1, send), reserver.reserve("key", 2, send)),
+            timeout=1,
+        )
+
+    asyncio.run(run())
+
+    assert send.calls == [(3, [1, 2])]
+
+
+@account_rate_limit(type="google_account", calculate_request_count=True, batch=True)
+async def crawl(num_results=1, *, account=None, account_id=None, request_count=None):
+    return account_id, request_count
+
+
+@pytest.fixture
+def reserve_route():
+    with respx.mock(base_url=BASE_URL) as router:
+        yield router.post("/api/v1/accounts/google_account/reserve").mock(
+            side_effect=lambda request: httpx.Response(
+                200,
+                json={
+                    "account": {},
+                    "account_id": "acc-1",
+                    "request_count": json.loads(request.content)["request_count"],
+                },
+            )
+        )
+
+
+def test_decorator_batches_concurrent_calls(reserve_route):
+    async def run():
+        return await asyncio.gather(crawl(1), crawl(2), crawl(3))
+
+    assert asyncio.run(run()) == [("acc-1", 1), ("acc-1", 2), ("acc-1", 3)]
+    assert reserve_route.call_count == 1
+    assert json.loads(reserve_route.calls[0].request.content) == {
+        "request_count": 6,
+        "batch": [1, 2, 3],
+    }
+
+
+def test_decorator_sends_lone_call_without_batch_payload(reserve_route):
+    assert asyncio.run(crawl(5)) == ("acc-1", 5)
+    assert json.loads(reserve_route.calls[0].request.content) == {"request_count": 5}
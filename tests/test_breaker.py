@@ -0,0 +1,131 @@
+from account_service_client.breaker import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _breaker(clock, **kwargs):
+    options = {"min_requests": 4, "failure_threshold": 0.5, "cooldown": 5.0}
+    options.update(kwargs)
+    return CircuitBreaker(clock=clock, **options)
+
+
+def _trip(breaker):
+    for _ in range(4):
+        breaker.record_failure()
+
+
+def test_stays_closed_below_min_requests():
+    breaker = _breaker(FakeClock())
+    for _ in range(3):
+        breaker.record_failure()
+
+    assert not breaker.is_open()
+
+
+def test_stays_closed_below_failure_threshold():
+    breaker = _breaker(FakeClock())
+    for _ in range(3):
+        breaker.record_success()
+    breaker.record_failure()
+
+    assert not breaker.is_open()
+
+
+def test_opens_at_failure_threshold():
+    breaker = _breaker(FakeClock())
+    _trip(breaker)
+
+    assert breaker.is_open()
+
+
+def test_half_open_admits_a_single_probe_after_cooldown():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    _trip(breaker)
+
+    clock.now = 4.9
+    assert breaker.is_open()
+
+    clock.now = 5.0
+    assert not breaker.is_open()
+    assert breaker.is_open()
+
+
+def test_successful_probe_closes_and_resets():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    _trip(breaker)
+    clock.now = 5.0
+    assert not breaker.is_open()
+
+    breaker.record_success(probe=True)
+
+    assert not breaker.is_open()
+    # Counts were reset, so the earlier failures do not re-trip it.
+    for _ in range(3):
+        breaker.record_failure()
+    assert not breaker.is_open()
+
+
+def test_failed_probe_reopens_for_another_cooldown():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    _trip(breaker)
+    clock.now = 5.0
+    assert not breaker.is_open()
+
+    breaker.record_failure(probe=True)
+
+    clock.now = 9.9
+    assert breaker.is_open()
+    clock.now = 10.0
+    assert not breaker.is_open()
+
+
+def test_late_outcomes_while_open_are_ignored():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    _trip(breaker)
+
+    # Calls that were already in flight when the breaker tripped report back late.
+    breaker.record_success()
+    assert breaker.is_open()
+
+    clock.now = 5.0
+    assert not breaker.is_open()
+    breaker.record_success()
+    breaker.record_failure()
+
+    # Neither closed nor re-armed it: the probe is still outstanding.
+    assert breaker.is_open()
+    breaker.record_success(probe=True)
+    assert not breaker.is_open()
+
+
+def test_probe_that_never_reports_is_replaced_after_cooldown():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    _trip(breaker)
+    clock.now = 5.0
+    assert not breaker.is_open()
+
+    clock.now = 10.0
+    assert not breaker.is_open()
+
+
+def test_failures_outside_the_window_are_forgotten():
+    clock = FakeClock()
+    breaker = _breaker(clock, window=10.0, buckets=10)
+    for _ in range(3):
+        breaker.record_failure()
+
+    clock.now = 11.0
+    breaker.record_failure()
+
+    assert not breaker.is_open()
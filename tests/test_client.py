@@ -0,0 +1,91 @@
+import asyncio
+import gc
+
+import httpx
+import respx
+
+from account_service_client import aclose_shared_clients, account_rate_limit
+from account_service_client import client as client_module
+from account_service_client.client import AccountServiceClient
+
+from .conftest import BASE_URL
+
+
+@account_rate_limit(type="google_account")
+async def crawl(*, account=None, account_id=None, request_count=None):
+    return account_id
+
+
+def _mock_reserve(router):
+    return router.post("/api/v1/accounts/google_account/reserve").mock(
+        return_value=httpx.Response(200, json={"account": {}, "account_id": "acc-1"})
+    )
+
+
+def test_shared_client_is_reused_within_a_loop():
+    async def run():
+        first = AccountServiceClient.get_shared(BASE_URL)
+        second = AccountServiceClient.get_shared(BASE_URL)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first is second
+
+
+def test_repeated_asyncio_run_leaves_no_shared_clients():
+    with respx.mock(base_url=BASE_URL) as router:
+        _mock_reserve(router)
+        shared = []
+
+        async def run():
+            assert await crawl() == "acc-1"
+            shared.append(AccountServiceClient.get_shared(BASE_URL))
+
+        for _ in range(5):
+            asyncio.run(run())
+
+    gc.collect()
+    assert len(client_module._shared_clients) == 0
+    assert all(client.client.is_closed for client in shared)
+
+
+def test_shared_clients_can_be_recreated_after_aclose():
+    async def run():
+        first = AccountServiceClient.get_shared(BASE_URL)
+        await aclose_shared_clients()
+        second = AccountServiceClient.get_shared(BASE_URL)
+        # The first closer is gone for good; collecting it must not close `second`.
+        gc.collect()
+        await asyncio.sleep(0)
+        return first, second, second.client.is_closed
+
+    first, second, second_closed_early = asyncio.run(run())
+    assert first is not second
+    assert first.client.is_closed
+    assert not second_closed_early
+    assert second.client.is_closed
+
+
+def test_manually_closed_loop_is_swept_on_next_use():
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(_get_shared())
+    loop.close()
+    assert loop in client_module._shared_clients
+
+    asyncio.run(_get_shared())
+    assert loop not in client_module._shared_clients
+
+
+async def _get_shared():
+    AccountServiceClient.get_shared(BASE_URL)
+
+
+def test_zero_keepalive_does_not_limit_concurrent_connections(monkeypatch, live_server):
+    monkeypatch.setenv("ACCOUNT_SERVICE_MAX_KEEPALIVE", "0")
+    monkeypatch.setenv("ACCOUNT_SERVICE_TIMEOUT", "1")
+    live_server.response_delay = 0.3
+
+    async def run():
+        return await asyncio.gather(*(crawl() for _ in range(8)))
+
+    assert asyncio.run(run()) == ["acc-1"] * 8
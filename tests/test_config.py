@@ -0,0 +1,30 @@
+import pytest
+
+from account_service_client.config import ClientConfig
+
+
+def test_from_env_reads_keepalive_settings(monkeypatch):
+    monkeypatch.setenv("ACCOUNT_SERVICE_MAX_KEEPALIVE", "5")
+    monkeypatch.setenv("ACCOUNT_SERVICE_KEEPALIVE_EXPIRY", "2.5")
+
+    config = ClientConfig.from_env()
+
+    assert config.max_keepalive == 5
+    assert config.keepalive_expiry == 2.5
+
+
+def test_from_env_rejects_negative_max_keepalive(monkeypatch):
+    monkeypatch.setenv("ACCOUNT_SERVICE_MAX_KEEPALIVE", "-1")
+
+    with pytest.raises(ValueError, match="ACCOUNT_SERVICE_MAX_KEEPALIVE"):
+        ClientConfig.from_env()
+
+
+def test_cached_returns_same_instance_until_reset(monkeypatch):
+    first = ClientConfig.cached()
+    assert ClientConfig.cached() is first
+
+    monkeypatch.setenv("ACCOUNT_SERVICE_TIMEOUT", "3")
+    ClientConfig.reset_cache()
+
+    assert ClientConfig.cached().timeout == 3.0
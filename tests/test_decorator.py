@@ -0,0 +1,290 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+import respx
+
+from account_service_client import (
+    AccountServiceError,
+    account_rate_limit,
+    reset_reserve_fallback_cache,
+)
+from account_service_client import decorator as decorator_module
+
+from .conftest import BASE_URL
+
+
+@account_rate_limit(type="legacy")
+async def crawl(*, account_id=None, account=None, request_count=None):
+    return account_id
+
+
+def _mock_legacy_server(router):
+    routes = {
+        "reserve": router.post("/api/v1/accounts/legacy/reserve").mock(
+            return_value=httpx.Response(404)
+        ),
+        "get": router.get("/api/v1/accounts/legacy/get").mock(
+            return_value=httpx.Response(200, json={"account": {}, "account_id": "acc-1"})
+        ),
+        "update": router.post("/api/v1/accounts/acc-1/rate-limit/update").mock(
+            return_value=httpx.Response(200, json={})
+        ),
+    }
+    return routes
+
+
+def _run_calls(*calls):
+    async def run():
+        return [await call() for call in calls]
+
+    return asyncio.run(run())
+
+
+def test_missing_reserve_endpoint_is_remembered():
+    with respx.mock(base_url=BASE_URL) as router:
+        routes = _mock_legacy_server(router)
+        assert _run_calls(crawl, crawl) == ["acc-1", "acc-1"]
+
+    assert routes["reserve"].call_count == 1
+    assert routes["get"].call_count == 2
+    assert routes["update"].call_count == 2
+
+
+def test_override_404_is_not_remembered():
+    with respx.mock(base_url=BASE_URL) as router:
+        routes = _mock_legacy_server(router)
+        _run_calls(lambda: crawl(account_id="missing"), crawl)
+
+    assert routes["reserve"].call_count == 2
+    assert routes["reserve"].calls[0].request.headers["x-user-id"] == "missing"
+
+
+def test_404_from_both_endpoints_is_not_remembered():
+    with respx.mock(base_url=BASE_URL, assert_all_called=False) as router:
+        routes = _mock_legacy_server(router)
+        routes["get"].mock(return_value=httpx.Response(404, text="no such type"))
+        with pytest.raises(AccountServiceError, match=r"\(404\)"):
+            _run_calls(crawl)
+        with pytest.raises(AccountServiceError, match=r"\(404\)"):
+            _run_calls(crawl)
+
+    assert routes["reserve"].call_count == 2
+    assert routes["update"].call_count == 0
+
+
+def test_missing_reserve_endpoint_is_retried_after_ttl(monkeypatch):
+    monkeypatch.setattr(decorator_module, "_LEGACY_RESERVE_TTL", 0.0)
+    with respx.mock(base_url=BASE_URL) as router:
+        routes = _mock_legacy_server(router)
+        _run_calls(crawl, crawl)
+
+    assert routes["reserve"].call_count == 2
+
+
+def test_reset_reserve_fallback_cache():
+    with respx.mock(base_url=BASE_URL) as router:
+        routes = _mock_legacy_server(router)
+        _run_calls(crawl)
+        reset_reserve_fallback_cache()
+        _run_calls(crawl)
+
+    assert routes["reserve"].call_count == 2
+
+
+@account_rate_limit(type="google_account")
+async def reserve_crawl(*, account_id=None, account=None, request_count=None):
+    return account_id
+
+
+def _reserved(account_id="acc-1"):
+    return httpx.Response(200, json={"account": {}, "account_id": account_id})
+
+
+def test_429_is_retried_with_backoff(monkeypatch):
+    monkeypatch.setattr(decorator_module, "_RATE_LIMIT_BACKOFF", 0.0)
+    with respx.mock(base_url=BASE_URL) as router:
+        route = router.post("/api/v1/accounts/google_account/reserve").mock(
+            side_effect=[
+                httpx.Response(429),
+                httpx.Response(429, headers={"retry-after": "0"}),
+                _reserved(),
+            ]
+        )
+        assert _run_calls(reserve_crawl) == ["acc-1"]
+
+    assert route.call_count == 3
+
+
+def test_429_retries_are_bounded(monkeypatch):
+    monkeypatch.setattr(decorator_module, "_RATE_LIMIT_BACKOFF", 0.0)
+    with respx.mock(base_url=BASE_URL) as router:
+        route = router.post("/api/v1/accounts/google_account/reserve").mock(
+            return_value=httpx.Response(429)
+        )
+        with pytest.raises(AccountServiceError, match=r"\(429\)"):
+            _run_calls(reserve_crawl)
+
+    assert route.call_count == decorator_module._RATE_LIMIT_RETRIES + 1
+
+
+def test_429_with_retry_after_above_cap_is_not_retried():
+    with respx.mock(base_url=BASE_URL) as router:
+        route = router.post("/api/v1/accounts/google_account/reserve").mock(
+            return_value=httpx.Response(429, headers={"retry-after": "30"})
+        )
+        with pytest.raises(AccountServiceError, match=r"\(429\)"):
+            _run_calls(reserve_crawl)
+
+    assert route.call_count == 1
+
+
+def test_rate_limit_delay_honours_retry_after():
+    response = httpx.Response(429, headers={"retry-after": "1.5"})
+
+    assert decorator_module._rate_limit_delay(response, attempt=0) == 1.5
+
+
+def test_rate_limit_delay_jitter_is_bounded(monkeypatch):
+    monkeypatch.setattr(decorator_module.random, "uniform", lambda low, high: high)
+    response = httpx.Response(429, headers={"retry-after": "soon"})
+
+    assert decorator_module._rate_limit_delay(response, attempt=1) == pytest.approx(
+        decorator_module._RATE_LIMIT_BACKOFF * 2
+    )
+
+
+def test_open_circuit_short_circuits_without_http():
+    with respx.mock(base_url=BASE_URL) as router:
+        route = router.post("/api/v1/accounts/google_account/reserve").mock(
+            return_value=httpx.Response(503, text="down")
+        )
+        errors = []
+
+        async def run():
+            for _ in range(25):
+                try:
+                    await reserve_crawl()
+                except AccountServiceError as exc:
+                    errors.append(str(exc))
+
+        asyncio.run(run())
+
+    assert route.call_count == 20
+    assert errors[-1] == "Account Service circuit is open; skipping request"
+
+
+def test_client_errors_do_not_open_the_circuit():
+    with respx.mock(base_url=BASE_URL) as router:
+        route = router.post("/api/v1/accounts/google_account/reserve").mock(
+            return_value=httpx.Response(400, text="bad")
+        )
+
+        async def run():
+            for _ in range(25):
+                with pytest.raises(AccountServiceError, match=r"\(400\)"):
+                    await reserve_crawl()
+
+        asyncio.run(run())
+
+    assert route.call_count == 25
+
+
+def test_pool_timeouts_do_not_open_the_circuit():
+    with respx.mock(base_url=BASE_URL) as router:
+        route = router.post("/api/v1/accounts/google_account/reserve").mock(
+            side_effect=httpx.PoolTimeout("pool exhausted")
+        )
+
+        async def run():
+            for _ in range(25):
+                with pytest.raises(AccountServiceError, match="pool exhausted"):
+                    await reserve_crawl()
+
+        asyncio.run(run())
+
+    assert route.call_count == 25
+
+
+def test_only_the_half_open_probe_closes_the_circuit():
+    now = [0.0]
+    breaker = decorator_module.CircuitBreaker(min_requests=1, clock=lambda: now[0])
+    decorator_module._breakers[BASE_URL] = breaker
+    breaker.record_failure()
+
+    with respx.mock(base_url=BASE_URL) as router:
+        route = router.post("/api/v1/accounts/google_account/reserve").mock(
+            return_value=_reserved()
+        )
+
+        async def run():
+            # A success recorded outside the probe, e.g. by a call that was already in
+            # flight, leaves the circuit open.
+            breaker.record_success()
+            with pytest.raises(AccountServiceError, match="circuit is open"):
+                await reserve_crawl()
+            now[0] = 5.0
+            return [await reserve_crawl(), await reserve_crawl()]
+
+        assert asyncio.run(run()) == ["acc-1", "acc-1"]
+
+    assert route.call_count == 2
+
+
+@account_rate_limit(type="google_account")
+async def plain_crawl(query, **injected):
+    return injected["account_id"]
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda: reserve_crawl("positional"),
+        lambda: reserve_crawl(unknown=1),
+        lambda: plain_crawl("a", "b"),
+        lambda: plain_crawl("a", query="b"),
+    ],
+)
+def test_invalid_arguments_raise_before_reserving(call):
+    with respx.mock(base_url=BASE_URL, assert_all_called=False) as router:
+        route = router.post("/api/v1/accounts/google_account/reserve").mock(
+            return_value=_reserved()
+        )
+        with pytest.raises(TypeError):
+            _run_calls(call)
+
+    assert route.call_count == 0
+
+
+@account_rate_limit(type="google_account", request_count=3)
+async def fixed_crawl(query, **injected):
+    return injected
+
+
+@account_rate_limit(type="google_account", calculate_request_count=True)
+async def uncounted_crawl(query, records_per_page=10, **injected):
+    return injected
+
+
+def test_signature_without_resolver_arguments_uses_the_lean_wrapper():
+    assert plain_crawl.__code__.co_name == "lean_wrapper"
+    assert fixed_crawl.__code__.co_name == "lean_wrapper"
+    assert reserve_crawl.__code__.co_name == "wrapper"
+
+
+def test_calculated_count_without_num_results_uses_the_lean_wrapper():
+    assert uncounted_crawl.__code__.co_name == "lean_wrapper"
+
+
+def test_lean_wrapper_reserves_the_fixed_count_without_an_override():
+    with respx.mock(base_url=BASE_URL) as router:
+        route = router.post("/api/v1/accounts/google_account/reserve").mock(
+            return_value=_reserved()
+        )
+        (injected,) = _run_calls(lambda: fixed_crawl("q"))
+
+    request = route.calls.last.request
+    assert json.loads(request.content) == {"request_count": 3}
+    assert "x-user-id" not in request.headers
+    assert injected == {"account": {}, "account_id": "acc-1", "request_count": 3}
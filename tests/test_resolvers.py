@@ -0,0 +1,85 @@
+import inspect
+
+import pytest
+
+from account_service_client._resolvers import (
+    ARGUMENT_KEYS,
+    build_argument_plan,
+    build_call_shape,
+    call_fits,
+    collect_arguments,
+)
+
+
+def positional(num_results, records_per_page=10, account_id=None):
+    pass
+
+
+def keyword_only(*, num_results=None, page_size=5, account_id=None):
+    pass
+
+
+def positional_only(num_results, /, per_page=3, *, x_user_id=None):
+    pass
+
+
+def variadic(num_results, *args, account_override=None, **kwargs):
+    pass
+
+
+def positional_only_with_kwargs(num_results, /, **kwargs):
+    pass
+
+
+CALLS = [
+    (positional, (), {}),
+    (positional, (50,), {}),
+    (positional, (50, 25), {}),
+    (positional, (50,), {"account_id": "acc-9"}),
+    (positional, (), {"records_per_page": 25, "num_results": 50}),
+    (keyword_only, (), {}),
+    (keyword_only, (), {"num_results": 50, "account_id": "acc-9"}),
+    (positional_only, (50,), {}),
+    (positional_only, (50,), {"per_page": 7, "x_user_id": "acc-9"}),
+    (positional_only, (50, 7), {}),
+    (variadic, (50, "a", "b"), {}),
+    (variadic, (), {"num_results": 50, "records_per_page": 5}),
+    (variadic, (50,), {"account_override": "acc-9", "other": 1}),
+    (positional_only_with_kwargs, (50,), {"num_results": 99}),
+]
+
+REJECTED_CALLS = [
+    (positional, (1, 2, 3, 4), {}),
+    (positional, (50,), {"num_results": 50}),
+    (positional, (), {"unknown": 1}),
+    (keyword_only, (50,), {}),
+    (positional_only, (), {"num_results": 50}),
+    (variadic, (50,), {"num_results": 50}),
+]
+
+
+def _bound(func, args, kwargs):
+    bound = inspect.signature(func).bind_partial(*args, **kwargs)
+    bound.apply_defaults()
+    return {name: value for name, value in bound.arguments.items() if name in ARGUMENT_KEYS}
+
+
+@pytest.mark.parametrize("func, args, kwargs", CALLS)
+def test_collect_arguments_matches_bind_partial(func, args, kwargs):
+    plan = build_argument_plan(inspect.signature(func))
+
+    assert collect_arguments(plan, args, kwargs) == _bound(func, args, kwargs)
+
+
+@pytest.mark.parametrize("func, args, kwargs", CALLS)
+def test_call_fits_accepts_what_bind_partial_accepts(func, args, kwargs):
+    assert call_fits(build_call_shape(inspect.signature(func)), args, kwargs)
+
+
+@pytest.mark.parametrize("func, args, kwargs", REJECTED_CALLS)
+def test_call_fits_rejects_what_bind_partial_rejects(func, args, kwargs):
+    signature = inspect.signature(func)
+    with pytest.raises(TypeError):
+        signature.bind_partial(*args, **kwargs)
+
+    assert not call_fits(build_call_shape(signature), args, kwargs)